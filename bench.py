@@ -0,0 +1,235 @@
+"""
+A regression benchmark suite for the solver's hot paths.
+
+Each benchmark case times one hot path (compare, filtersFromRes,
+FilterSet.applyAll on lists and on WordViews, scrabbleGuesser,
+minOptionGuesser, solve_bee.solve) on a fixed set of words, sampled with a fixed seed from the corpus for a
+particular word length. For each case, the ops/sec and peak memory
+(via tracemalloc) are recorded, and compared against the baselines
+stored in bench_baselines.json. A run fails (exits nonzero) if any case
+got slower / used more memory than its baseline by more than the threshold.
+
+This never touches the web interface, so it runs offline with no browser.
+
+Example:
+
+    python bench.py                  # Compare against the stored baselines
+    python bench.py --update         # Re-record the baselines
+    python bench.py --only compare   # Only run cases with 'compare' in the name
+"""
+from res import filtersFromRes, compare
+from filt import FilterSet
+from corpus import getCorpus
+import guess
+import solve_bee
+
+import json
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+import numpy as np
+
+BASELINE_FNAME = "bench_baselines.json"
+LENGTHS = [3, 5, 8, 9]
+SEED = 1234
+
+# Number of words in the fixed word sets for each case
+N_PAIRS = 50
+N_FILTER_WORDS = 2000
+N_MIN_OPTION_WORDS = 200
+
+MIN_TIME = 0.2 # Time (seconds) to keep repeating an op for each round
+ROUNDS = 3     # Take the best of this many rounds
+DEFAULT_THRESHOLD = 0.5
+
+
+def fixedWords(length, n, seed=SEED):
+    """ A fixed sample of n words (in corpus order) of a given length """
+    wordArr = getCorpus(length).words
+    rng = np.random.default_rng(seed + length)
+    idx = np.sort(rng.choice(len(wordArr), size=min(n, len(wordArr)), replace=False))
+    return [wordArr[i] for i in idx]
+
+
+############################################################
+# Benchmark cases, each of these takes a length and
+# returns a function (taking no args) that does one op
+############################################################
+
+def benchCompare(length):
+    words = fixedWords(length, 2 * N_PAIRS)
+    pairs = list(zip(words[::2], words[1::2]))
+    return lambda: [compare(known, g) for known, g in pairs]
+
+
+def benchFiltersFromRes(length):
+    words = fixedWords(length, 2 * N_PAIRS)
+    pairs = [(compare(known, g), g) for known, g in zip(words[::2], words[1::2])]
+    return lambda: [filtersFromRes(res, g) for res, g in pairs]
+
+
+def _filterSet(length, wordArr):
+    """ The filter set learned from guessing the first word, when the answer is the last """
+    return FilterSet(filtersFromRes(compare(wordArr[-1], wordArr[0]), wordArr[0]))
+
+
+def benchApplyAll(length):
+    wordArr = fixedWords(length, N_FILTER_WORDS)
+    fs = _filterSet(length, wordArr)
+    return lambda: fs.applyAll(wordArr)
+
+
+def benchApplyAllView(length):
+    """ Same as benchApplyAll, but through a WordView (the path the Solver uses) """
+    corpus = getCorpus(length)
+    wordArr = fixedWords(length, N_FILTER_WORDS)
+    view = corpus.view([corpus.indexOf(word) for word in wordArr])
+    fs = _filterSet(length, wordArr)
+    return lambda: fs.applyAll(view)
+
+
+def benchScrabbleGuesser(length):
+    wordArr = fixedWords(length, N_FILTER_WORDS)
+    fs = _filterSet(length, wordArr)
+    return lambda: guess.scrabbleGuesser(wordArr, fs=fs, guess_num=2)
+
+
+def benchMinOptionGuesser(length):
+    wordArr = fixedWords(length, N_MIN_OPTION_WORDS)
+    return lambda: guess.minOptionGuesser(wordArr, fs=FilterSet(), guess_num=2)
+
+
+def benchSolveBee(length):
+    wordArr = fixedWords(length, N_FILTER_WORDS)
+    letters = sorted(set(''.join(wordArr[:3])))[:6]
+    midLetter = wordArr[0][0]
+    return lambda: solve_bee.solve(midLetter, letters, wordArr=wordArr, minLength=length)
+
+
+BENCH_FUNCS = {
+    'compare': benchCompare,
+    'filtersFromRes': benchFiltersFromRes,
+    'applyAll': benchApplyAll,
+    'applyAllView': benchApplyAllView,
+    'scrabbleGuesser': benchScrabbleGuesser,
+    'minOptionGuesser': benchMinOptionGuesser,
+    'solve_bee': benchSolveBee,
+}
+
+CASES = {f"{name}[length{length}]": (func, length)
+         for name, func in BENCH_FUNCS.items() for length in LENGTHS}
+
+
+############################################################
+# Running / checking the benchmarks
+############################################################
+
+def measure(op, min_time=MIN_TIME, rounds=ROUNDS):
+    """
+    Return (ops/sec, peak memory in KiB) for an op, taking the best
+    ops/sec over several rounds. Memory is measured in a separate
+    single run, since tracemalloc slows things down.
+    """
+    best = 0
+    for _ in range(rounds):
+        n, start = 0, time.perf_counter()
+        while True:
+            op()
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, n / elapsed)
+
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024
+
+
+def runCases(names, **kw):
+    """ Run the given benchmark cases, returning a dict of results """
+    results = {}
+    for name in names:
+        func, length = CASES[name]
+        ops, peak = measure(func(length), **kw)
+        results[name] = {'ops_per_sec': ops, 'peak_kib': peak}
+        print(f"{name:<32} {ops:>12.2f} ops/sec {peak:>12.1f} KiB")
+    return results
+
+
+def regressions(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """
+    Return a list of messages for every case in results that regressed
+    (is slower / uses more memory) beyond threshold relative to baselines
+    """
+    msgs = []
+    for name, res in results.items():
+        if name not in baselines:
+            continue
+        base = baselines[name]
+        if res['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            msgs.append(f"{name}: {res['ops_per_sec']:.2f} ops/sec, "
+                        f"baseline was {base['ops_per_sec']:.2f}")
+        if res['peak_kib'] > base['peak_kib'] * (1 + threshold):
+            msgs.append(f"{name}: {res['peak_kib']:.1f} KiB peak, "
+                        f"baseline was {base['peak_kib']:.1f}")
+    return msgs
+
+
+def load_baselines(fname=BASELINE_FNAME):
+    try:
+        with open(fname, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(baselines, fname=BASELINE_FNAME):
+    with open(fname, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def getArgs():
+    """
+    Parse the arguments
+    """
+    p = ArgumentParser(description="Benchmark the solver's hot paths")
+    p.add_argument('--update', action="store_true",
+                   help="Record the results as the new baselines instead of checking them.")
+    p.add_argument('--only', default='',
+                   help="Only run cases whose name contains this string.")
+    p.add_argument('--threshold', default=DEFAULT_THRESHOLD, type=float,
+                   help="Fraction a case can regress by before the run fails.")
+    p.add_argument('--min_time', default=MIN_TIME, type=float,
+                   help="Seconds to repeat each op for in each round.")
+    p.add_argument('--baselines', default=BASELINE_FNAME,
+                   help="JSON file the baselines are stored in.")
+    return p.parse_args()
+
+
+def main():
+    args = getArgs()
+    names = [name for name in CASES if args.only in name]
+    results = runCases(names, min_time=args.min_time)
+
+    baselines = load_baselines(args.baselines)
+    if args.update:
+        baselines.update(results)
+        save_baselines(baselines, args.baselines)
+        print(f"Saved baselines to {args.baselines}")
+        return
+
+    msgs = regressions(results, baselines, threshold=args.threshold)
+    for msg in msgs:
+        print(f"REGRESSION {msg}")
+    if msgs:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+A module defining how the solver stores its list of words.
+
+A Corpus is an immutable list of words (all the same length), along with
+a (nWords, LENGTH) numpy array of their letters that filters can be applied
+to directly. A WordView is a subset of a corpus, stored as an array of indices
+into the corpus, that behaves like a (read only) list of words. Narrowing a
+view down (by filters, or by excluding words) only ever touches the words
+in the view, and never copies or modifies the corpus.
+
+Corpora are loaded through getCorpus, a process wide registry that loads
+each word length once (and is safe to call from multiple threads). Since
+corpora are never modified, worker processes forked after loading (see
+preload) share the parent's copy of them.
+"""
+from collections.abc import Sequence
+import glob
+import os
+import re
+import threading
+
+import numpy as np
+
+__all__ = ['Corpus', 'WordView', 'getCorpus', 'preload', 'availableLengths', 'load_words']
+
+FNAME = "data/length{}.txt"
+
+class Corpus:
+    """
+    An immutable list of words, shared between everything that uses it
+    """
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.letters = np.array([list(word) for word in self.words])
+        self.letters.flags.writeable = False
+        self._word2idx = {word: i for i, word in enumerate(self.words)}
+
+    def __len__(self):
+        return len(self.words)
+
+    def indexOf(self, word):
+        """ Return the index of word in the corpus, or None if it isn't there """
+        return self._word2idx.get(word)
+
+    def view(self, idx=None):
+        """ Return a WordView of the words at idx (all the words by default) """
+        if idx is None:
+            idx = np.arange(len(self.words))
+        return WordView(self, idx)
+
+
+class WordView(Sequence):
+    """
+    A read only list of words from a corpus, stored as indices into
+    the corpus. Can be indexed / iterated over like a list of words.
+    """
+
+    def __init__(self, corpus, idx):
+        self.corpus = corpus
+        self.idx = np.asarray(idx, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.idx)
+
+    def __getitem__(self, i):
+        if isinstance(i, (slice, np.ndarray)):
+            return WordView(self.corpus, self.idx[i])
+        return self.corpus.words[self.idx[i]]
+
+    def __iter__(self):
+        words = self.corpus.words
+        return (words[i] for i in self.idx)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+    @property
+    def letters(self):
+        """ The (len(self), LENGTH) array of letters of the words in this view """
+        return self.corpus.letters[self.idx]
+
+    def filter(self, fs):
+        """ Return a WordView of the words in this view that meet all the filters in fs """
+        return WordView(self.corpus, self.idx[fs.mask(self.letters)])
+
+    def exclude(self, mask):
+        """
+        Return a WordView without the words in this view that are True in mask,
+        a boolean vector over the whole corpus
+        """
+        return WordView(self.corpus, self.idx[~mask[self.idx]])
+
+
+############################################################
+# The corpus registry
+############################################################
+
+_corpora = {}
+_lock = threading.Lock()
+
+def _resetLock():
+    """ A lock held by another thread while forking would never be released in the child """
+    global _lock
+    _lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_resetLock)
+
+
+def load_words(length, fname=FNAME):
+    """ Load the list of words """
+    with open(fname.format(length), 'r') as f:
+        wordArr = [l.strip() for l in f.readlines()]
+    return wordArr
+
+
+def getCorpus(length, fname=FNAME):
+    """
+    Return the Corpus of words with a given length, loading
+    it from fname the first time it's asked for in this process
+    """
+    key = fname.format(length)
+    corpus = _corpora.get(key)
+    if corpus is None:
+        with _lock:
+            corpus = _corpora.get(key)
+            if corpus is None:
+                corpus = _corpora[key] = Corpus(load_words(length, fname=fname))
+    return corpus
+
+
+def preload(lengths, fname=FNAME):
+    """
+    Load the corpora for several lengths up front, e.g. before forking
+    worker processes so they all share the same copy
+    """
+    for length in lengths:
+        getCorpus(length, fname=fname)
+
+
+def availableLengths(fname=FNAME):
+    """ Return the (sorted) word lengths there are corpus files for """
+    pattern = re.escape(fname).replace(re.escape('{}'), r'(\d+)')
+    lengths = [int(re.fullmatch(pattern, path).group(1))
+               for path in glob.glob(fname.format('*'))
+               if re.fullmatch(pattern, path)]
+    return sorted(lengths)
@@ -1,7 +1,27 @@
+import json
+import os
+from argparse import ArgumentParser
+
 BASE_FNAME = "full_dict.txt"
 OUT_FORMAT = "length{}.txt"
 
-def main():
+# The rejected words recorded by rejected.RejectedStore (game -> length -> word -> count)
+REJECTED_FNAME = "rejected.json"
+PRUNED_DIR = "pruned"
+# Only prune words rejected at least this many times, since the website also
+# gives an unresolved result when it's slow (mirrors rejected.MIN_COUNT)
+MIN_COUNT = 2
+
+# What a rejected guess costs on the website: typing and then clearing each
+# letter (SMOL_SLEEP each), plus waiting for the result to resolve
+# MAX_WEB_RETRIEVE_RETRIES times (BIG_SLEEP each). These mirror
+# web_interface.SMOL_SLEEP, web_interface.BIG_SLEEP and
+# solve.MAX_WEB_RETRIEVE_RETRIES (which aren't imported, since this
+# runs from data/, and web_interface needs selenium), so keep them in sync.
+SMOL_SLEEP, BIG_SLEEP, MAX_WEB_RETRIEVE_RETRIES = 0.1, 1, 3
+RETRY_SECONDS = lambda length: 2 * length * SMOL_SLEEP + MAX_WEB_RETRIEVE_RETRIES * BIG_SLEEP
+
+def split():
     fs = {}
     with open(BASE_FNAME, 'r') as f:
         for line in f:
@@ -14,6 +34,48 @@ def main():
         fobj.close()
 
 
+def prune(game, min_count=MIN_COUNT, rejected_fname=REJECTED_FNAME, out_dir=PRUNED_DIR):
+    """
+    Write the word list for each length (that game rejected words of)
+    to out_dir, without the words rejected at least min_count times, and
+    print how many web retries the pruned words cost / will save.
+    """
+    with open(rejected_fname, 'r') as f:
+        rejected = json.load(f).get(game, {})
+
+    os.makedirs(out_dir, exist_ok=True)
+    for length, words in sorted(rejected.items(), key=lambda kv: int(kv[0])):
+        length = int(length)
+        with open(OUT_FORMAT.format(length), 'r') as f:
+            wordArr = [l.strip() for l in f]
+        pruned = [word for word in wordArr if words.get(word, 0) < min_count]
+        with open(os.path.join(out_dir, OUT_FORMAT.format(length)), 'w') as f:
+            for word in pruned:
+                print(word, file=f)
+
+        # Only words that were in the list can cost a retry (at most once per run)
+        retries = sum(words.values())
+        n_pruned = len(wordArr) - len(pruned)
+        print(f"length {length}: pruned {n_pruned} of {len(wordArr)} words, "
+              f"learned from {retries} web retries, saves up to {n_pruned} retries "
+              f"(~{n_pruned * RETRY_SECONDS(length):.1f}s) per run")
+
+
+def main():
+    p = ArgumentParser(description="Split the full dictionary into word lists for each length")
+    p.add_argument('--prune', action="store_true",
+                   help=f"Instead write word lists without the words in {REJECTED_FNAME} to {PRUNED_DIR}/")
+    p.add_argument('--game', default="wordle",
+                   help="The game to prune the words it rejected for.")
+    p.add_argument('--min_count', default=MIN_COUNT, type=int,
+                   help="Only prune words rejected at least this many times.")
+    args = p.parse_args()
+
+    if args.prune:
+        prune(args.game, min_count=args.min_count)
+    else:
+        split()
+
+
 if __name__ == "__main__":
     main()
-
@@ -12,6 +12,8 @@ There is also a FilterSet class, a subclass of pythons builtin set, with
 handy methods for applying all the filters in the set to a list of words / 
 summarizing the info from the filters in the set.
 """
+from corpus import WordView
+
 import numpy as np
 from functools import reduce
 from collections import defaultdict
@@ -72,14 +74,25 @@ class FilterSet(set):
     modified in the same way as a set.
     """
 
+    def mask(self, wordArr_np):
+        """
+        Take a numpy array of shape (nWords, LENGTH), return a numpy
+        boolean vector of shape nWords saying which words meet all the filters
+        """
+        return reduce(lambda x,y: x & y, [filt(wordArr_np) for filt in self],
+                      np.ones(len(wordArr_np), dtype=bool))
+
     def applyAll(self, wordArr):
         """
         Apply all the filters in this filter set to a list of words,
-        and return the words that meet all the criteria
+        and return the words that meet all the criteria. If wordArr
+        is a WordView, this returns a (narrower) WordView without
+        copying any words.
         """
+        if isinstance(wordArr, WordView):
+            return wordArr.filter(self)
         wordArr_np = np.char.array([list(word) for word in wordArr])
-        idx = reduce(lambda x,y: x & y, [filt(wordArr_np) for filt in self], True)
-        return [''.join(word) for word in wordArr_np[idx]]
+        return [''.join(word) for word in wordArr_np[self.mask(wordArr_np)]]
 
     def counts_by_type(self):
         """
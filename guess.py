@@ -11,40 +11,50 @@ very least takes a wordArr (list of strings), as well as **kw
 (to capture extra keyword args), and returns a specific word
 from wordArr as the guess. You can use other keyword arguments
 (e.g. fs: the filterset capturing info from previous guesses,
-guess_num: which guess we're on, verbose: whether to print 
+guess_num: which guess we're on, rejected: the words the submitter
+rejected, verbose: whether to print 
 a tqdm progress bar or not). To use other keyword arguments, just
 specify them when creating a Solver instance.
 """
-from res import VALID_RES, filtersFromRes
-from filt import FilterSet
+from res import compare, compareMany, correctCode
+from corpus import WordView
 
 from pprint import pprint
-import itertools
+from collections import Counter, defaultdict
+import logging
+import time
 
 from tqdm import tqdm
 import numpy as np
 
 # The guess functions that the solver will import / be able to use
 __all__ = ['randomGuesser', 'interactiveGuesser', 
-           'scrabbleGuesser', 'minOptionGuesser']
+           'scrabbleGuesser', 'minOptionGuesser', 'lookaheadGuesser']
 
 def hardCodeGuess(number2GuessMap={}):
     """
     Decorator that hard codes a specific guess for a specific
-    guess number
+    guess number (unless that guess is in the rejected words, or
+    isn't the same length as the words being guessed)
     """
     def decorator(guess_func):
-        def wrapped(wordArr, guess_num, **kw):
-            if guess_num in number2GuessMap:
-                return number2GuessMap[guess_num]
-            return guess_func(wordArr, guess_num=guess_num, **kw)
+        def wrapped(wordArr, guess_num, rejected=(), **kw):
+            hard_guess = number2GuessMap.get(guess_num)
+            if (hard_guess is not None and hard_guess not in rejected
+                    and (len(wordArr) == 0 or len(hard_guess) == len(wordArr[0]))):
+                return hard_guess
+            return guess_func(wordArr, guess_num=guess_num, rejected=rejected, **kw)
         return wrapped
     return decorator
 
 
-def randomGuesser(wordArr, **kw):
-    """ Choose a random word from the set of options as the guess """
-    return wordArr[np.random.choice(len(wordArr))]
+def randomGuesser(wordArr, rng=None, **kw):
+    """
+    Choose a random word from the set of options as the guess, using
+    rng (a np.random.Generator) if given, else the global numpy rng
+    """
+    rng = rng if rng is not None else np.random
+    return wordArr[rng.choice(len(wordArr))]
 
 
 def interactiveGuesser(wordArr, **kw):
@@ -107,30 +117,228 @@ def scrabbleGuesser(wordsArr, fs=None, guess_num=0,
     return max(wordsArr, key=word_scorer)
 
 
+############################################################
+# Anytime guessing (scoring as many probe words as possible
+# within a time budget, most promising first)
+############################################################
+
+class SearchBudget:
+    """
+    A time / node budget for a search. Once the budget is exhausted,
+    the search should stop expanding nodes and fall back on estimates.
+    """
+    def __init__(self, time_budget=None, node_budget=None):
+        self.deadline = None if time_budget is None else time.monotonic() + time_budget
+        self.node_budget = node_budget
+        self.nodes = 0
+
+    def expand(self):
+        """ Record that a node was expanded """
+        self.nodes += 1
+
+    def exhausted(self):
+        if self.node_budget is not None and self.nodes >= self.node_budget:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+def letterCoverageRank(wordArr):
+    """
+    Rank the words in wordArr by how common their (distinct) letters
+    are among the words in wordArr, most common first. This is a cheap
+    stand-in for how well a word splits up wordArr.
+    """
+    freqs = Counter(letter for word in wordArr for letter in set(word))
+    return sorted(wordArr, key=lambda word: -sum(freqs[l] for l in set(word)))
+
+
+def stratifiedSample(wordArr, size, rng=None):
+    """
+    Sample (about) size words from wordArr, taking from the words starting
+    with each letter in proportion to how many there are. Returns wordArr
+    itself if it has at most size words.
+    """
+    if len(wordArr) <= size:
+        return wordArr
+    rng = rng if rng is not None else np.random
+
+    strata = defaultdict(list)
+    for i, word in enumerate(wordArr):
+        strata[word[0]].append(i)
+
+    picks = []
+    for idxs in strata.values():
+        n = min(len(idxs), max(1, round(size * len(idxs) / len(wordArr))))
+        picks.extend(rng.choice(idxs, size=n, replace=False))
+    picks = np.sort(picks)
+
+    if isinstance(wordArr, WordView):
+        return wordArr[picks]
+    return [wordArr[i] for i in picks]
+
+
+def anytimeArgmin(score, probes, budget=None, verbose=False, stats=None):
+    """
+    Return the probe with the lowest score(probe, budget), scoring probes in
+    order until budget (a SearchBudget) runs out (at least one probe is always
+    scored). score should return None if the budget (a SearchBudget, or None
+    for the first probe, which always has to be finished) runs out partway
+    through a probe, and that probe is dropped.
+
+    How much of the probe space was covered is logged, and if stats
+    is a dict, filled in (as probes_scored / probes_total).
+    """
+    budget = budget if budget is not None else SearchBudget()
+    best, best_score, n = None, np.inf, 0
+
+    iterable = tqdm(probes, total=len(probes)) if verbose else probes
+    for probe in iterable:
+        if n > 0 and budget.exhausted():
+            break
+        probe_score = score(probe, budget if n > 0 else None)
+        if probe_score is None:
+            break
+        n += 1
+        if probe_score < best_score:
+            best, best_score = probe, probe_score
+
+    logging.info(f"Scored {n} of {len(probes)} probe words.")
+    if stats is not None:
+        stats.update(probes_scored=n, probes_total=len(probes))
+    return best
+
+
+# Number of words to compare a probe word against between checking the time budget
+CHUNK_SIZE = 2048
+
 @hardCodeGuess(number2GuessMap={ 0: "alien", 1: "torus"})
-def minOptionGuesser(wordArr, fs=None, do_max_not_avg=False, verbose=False, **kw):
+def minOptionGuesser(wordArr, do_max_not_avg=False, verbose=False,
+                     time_budget=None, sample_size=None, rng=None, stats=None, **kw):
     """
     Make guesses by choosing the word that limits the average (or max) number
-    of options after incorporating information about the word. The average
-    (or max) is taken over all (3 ** word_length) 
-    possible results from the guessed word.
+    of options after incorporating information about the word. The options
+    are bucketed by the result the guessed word would get against them, and
+    the average is the expected size of the bucket the actual word is in.
+
+    With a time_budget (seconds), words are scored most promising first
+    (by letterCoverageRank), and the best word when time runs out is guessed.
+    With a sample_size, options are counted among a stratifiedSample of (at
+    most) that many words instead of all of wordArr. Pass a dict as stats
+    to find out how many words were scored.
     """
-    opts = [0] * len(wordArr)
-    length = len(wordArr[0])
-    func = np.max if do_max_not_avg else np.mean
+    # Start the clock before ranking / sampling, which take a while for long word lists
+    budget = SearchBudget(time_budget=time_budget)
+    cands = wordArr if sample_size is None else stratifiedSample(wordArr, sample_size, rng=rng)
+    letters = cands.letters if isinstance(cands, WordView) else np.array([list(w) for w in cands])
+    probes = wordArr if time_budget is None else letterCoverageRank(wordArr)
+
+    def score(word, budget):
+        codes = []
+        for start in range(0, len(letters), CHUNK_SIZE):
+            if budget is not None and budget.exhausted():
+                return None
+            codes.append(compareMany(letters[start:start + CHUNK_SIZE], word))
+        _, cnts = np.unique(np.concatenate(codes), return_counts=True)
+        return cnts.max() if do_max_not_avg else (cnts ** 2).sum() / len(letters)
 
-    iterable = enumerate(wordArr)
-    if verbose:
-        iterable = tqdm(iterable, total=len(wordArr))
-    for i, word in iterable:
-        cnts = []
-        for res in itertools.product(VALID_RES, repeat=length):
-            fs2 = FilterSet(fs.copy())
-            fs2.update(filtersFromRes(res, word))
-            cnts.append(len(fs2.applyAll(wordArr)))
-        opts[i] = func(cnts)
+    return anytimeArgmin(score, probes, budget=budget, verbose=verbose, stats=stats)
 
-    return wordArr[np.argmin(opts)]
 
+############################################################
+# Lookahead guessing (a depth limited search over guesses
+# and the results they could produce)
+############################################################
+
+def partition(guess, wordArr):
+    """
+    Split wordArr into buckets by the result guessing guess would give
+    if each word were the actual word. Returns a dict mapping res codes
+    to the list of words giving that result.
+    """
+    buckets = defaultdict(list)
+    for word in wordArr:
+        buckets[compare(word, guess)].append(word)
+    return buckets
 
 
+def leafEstimate(n):
+    """
+    Estimate the expected number of guesses left to find the word among n options,
+    assuming the next guess is either right, or splits the rest perfectly
+    """
+    return 1 if n <= 1 else 2 - 1 / n
+
+
+def expectedGuesses(wordArr, depth, beam_width, table, budget):
+    """
+    Return (expected guesses, best guess) to find the word among wordArr,
+    searching depth guesses ahead over the beam_width best probe words
+    (by letterCoverageRank). Past the search depth, or once the budget
+    is exhausted, leafEstimate is used instead (and guesses that weren't
+    fully scored before the budget ran out are thrown away, unless no
+    guess was fully scored). Raises a ValueError if wordArr is empty.
+
+    table is the transposition table, mapping (frozenset(wordArr), depth)
+    to results, since many different results lead to the same set of options.
+    """
+    n = len(wordArr)
+    if n == 0:
+        raise ValueError("No words left to guess from")
+    if n == 1:
+        return 1, wordArr[0]
+    if depth == 0 or budget.exhausted():
+        return leafEstimate(n), wordArr[0]
+
+    key = (frozenset(wordArr), depth)
+    if key in table:
+        return table[key]
+
+    best = (np.inf, None)
+    for guess in letterCoverageRank(wordArr)[:beam_width]:
+        if best[1] is not None and budget.exhausted():
+            break
+        budget.expand()
+        score = 1
+        for res, bucket in partition(guess, wordArr).items():
+            if res == correctCode(len(guess)):
+                continue
+            sub, _ = expectedGuesses(bucket, depth - 1, beam_width, table, budget)
+            score += len(bucket) / n * sub
+
+        # If the budget ran out partway through, some of this guess's results were
+        # scored with leafEstimate (a lower bound), so it would look better than it is
+        if best[1] is not None and budget.exhausted():
+            break
+        if score < best[0]:
+            best = (score, guess)
+
+    # Don't cache results cut short by the budget, they may not be the best
+    if not budget.exhausted():
+        table[key] = best
+    return best
+
+
+@hardCodeGuess(number2GuessMap={ 0: "alien" })
+def lookaheadGuesser(wordArr, depth=2, beam_width=10, time_budget=None,
+                     node_budget=None, table=None, stats=None, **kw):
+    """
+    Make guesses by choosing the word that minimizes the expected number
+    of guesses remaining, searching depth (2 by default) guesses ahead.
+
+    Only the beam_width most promising probe words (by letterCoverageRank)
+    are searched at each step, and subproblems are memoized in a
+    transposition table keyed on the set of options left. Pass the same
+    table dict in as a keyword to reuse it across guesses.
+
+    time_budget (seconds) and node_budget (number of guesses searched)
+    bound the search so it can be run live, after which the best guess
+    found so far is returned. Pass a dict as stats to find out how many
+    guesses were searched (as nodes).
+    """
+    table = {} if table is None else table
+    budget = SearchBudget(time_budget=time_budget, node_budget=node_budget)
+    _, guess = expectedGuesses(list(wordArr), depth, beam_width, table, budget)
+    logging.info(f"Searched {budget.nodes} guesses.")
+    if stats is not None:
+        stats.update(nodes=budget.nodes)
+    return guess
@@ -0,0 +1,313 @@
+"""
+A module defining a local wordle game, a fast stand-in for the website.
+
+A LocalGame plays one game, in one of three modes:
+    * fixed: the answer is given up front
+    * random: the answer is chosen at random from the corpus
+    * adversarial: like Absurdle, there is no answer up front, instead every
+      guess gets the result that keeps the most words possible (so the answer
+      is only pinned down once there's one word left)
+
+LocalGame.submit is a submit func (takes a guess, returns its res code), so
+games can be played in-process, e.g.
+
+    game = LocalGame(mode='adversarial')
+    slv = Solver(submit_func=game.submit, guess_func=..., uses_web_interface=False)
+
+The same games can also be served over a local HTTP port (python local_game.py),
+speaking the same guess/result protocol as the website (a guess in, a list of
+'correct' / 'present' / 'absent' tiles out, 'tbd' for words it doesn't accept).
+HTTPGame is a client for that, whose submit is also a submit func.
+
+The HTTP protocol (all bodies are JSON):
+    POST /games              {"mode", "length", "guesses", "answer", "seed"} (all optional)
+                             -> {"id", "length", "guesses"}
+    POST /games/<id>/guess   {"guess"} -> {"tiles", "done", "answer"}
+    DELETE /games/<id>       -> {}
+"""
+from res import Res, INVALID_CODE, compare, compareMany, decodeRes, encodeRes, correctCode
+from corpus import getCorpus, availableLengths
+
+import itertools
+import json
+import logging
+import threading
+import urllib.request
+from collections import OrderedDict
+from argparse import ArgumentParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+__all__ = ['LocalGame', 'GameServer', 'HTTPGame']
+
+MODES = ['fixed', 'random', 'adversarial']
+DEFAULT_PORT = 8000
+
+class LocalGame:
+    """
+    A single game of wordle, played locally
+    """
+
+    def __init__(self, mode='random', answer=None, length=5, guesses=6, seed=None):
+        assert mode in MODES
+        assert (mode == 'fixed') == (answer is not None)
+        assert guesses > 0, "There has to be at least one guess"
+
+        self.mode = mode
+        self.length = len(answer) if answer is not None else length
+        self.guesses = guesses
+        self.corpus = getCorpus(self.length)
+        assert answer is None or self.corpus.indexOf(answer) is not None, \
+            f"{answer} isn't in the word list, so could never be guessed"
+        self._num_guessed = 0
+        self._done = False
+
+        # Adversarial games don't have an answer, just the words that could
+        # still be the answer, which only depend on the guesses so far
+        self._answer = answer
+        if mode == 'random':
+            rng = np.random.default_rng(seed)
+            self._answer = self.corpus.words[rng.choice(len(self.corpus))]
+        self._history = ()
+
+    @property
+    def done(self):
+        """ Whether the word was guessed or the guesses ran out """
+        return self._done
+
+    @property
+    def answer(self):
+        """ The answer, or None if an adversarial game hasn't settled on one yet """
+        if self._answer is None:
+            _, cands = _adversarialSplit(self.length, self._history)
+            return self.corpus.words[cands[0]] if len(cands) == 1 else None
+        return self._answer
+
+    def submit(self, guess):
+        """
+        Submit a guess (either string or array-like), returning the res code,
+        or INVALID_CODE for words not in the corpus (which don't use up a guess)
+        """
+        if not isinstance(guess, str):
+            guess = ''.join(guess)
+        assert not self._done, "The game is already over"
+        if self.corpus.indexOf(guess) is None:
+            return INVALID_CODE
+
+        if self._answer is not None:
+            code = compare(self._answer, guess)
+        else:
+            self._history += (guess,)
+            code, _ = _adversarialSplit(self.length, self._history)
+
+        self._num_guessed += 1
+        self._done = code == correctCode(self.length) or self._num_guessed == self.guesses
+        return code
+
+############################################################
+# Adversarial games
+############################################################
+
+# The words left in an adversarial game only depend on the guesses so far, so
+# they're cached (and shared between games, e.g. all games with the same
+# opening guess), keeping at most CACHE_BYTES of word indices
+CACHE_BYTES = 32 * 2 ** 20
+_splits = OrderedDict()
+_splitsBytes = 0
+_splitsLock = threading.Lock()
+
+def _biggestBucket(corpus, cands, guess):
+    """
+    Bucket the words at cands (indices into corpus) by the result guess would
+    get against them, and return (res code, cands) for the biggest bucket
+    (preferring anything but all CORRECT)
+    """
+    codes = compareMany(corpus.letters[cands], guess)
+    buckets, sizes = np.unique(codes, return_counts=True)
+    sizes[buckets == correctCode(len(guess))] = 0 if len(buckets) > 1 else 1
+    code = buckets[np.argmax(sizes)]
+    return int(code), cands[codes == code]
+
+
+def _adversarialSplit(length, history):
+    """
+    Return (res code of the last guess, cands) for an adversarial game after
+    the guesses in history, from the cache if it's there.
+
+    A split that isn't cached costs a compareMany over the words left, so
+    games whose guesses aren't shared (e.g. random guesses) run at about
+    100 games per second at length 5 (since every first guess compares
+    against the whole corpus), while games sharing their guesses run at
+    tens of thousands per second.
+    """
+    global _splitsBytes
+    key = (length, history)
+    with _splitsLock:
+        if key in _splits:
+            _splits.move_to_end(key)
+            return _splits[key]
+
+    corpus = getCorpus(length)
+    if not history:
+        code, cands = None, np.arange(len(corpus))
+    else:
+        _, cands = _adversarialSplit(length, history[:-1])
+        code, cands = _biggestBucket(corpus, cands, history[-1])
+    cands.flags.writeable = False
+
+    with _splitsLock:
+        if key not in _splits:
+            _splits[key] = (code, cands)
+            _splitsBytes += cands.nbytes
+            while _splitsBytes > CACHE_BYTES:
+                _, (_, old) = _splits.popitem(last=False)
+                _splitsBytes -= old.nbytes
+    return code, cands
+
+
+############################################################
+# Serving games over HTTP
+############################################################
+
+def tilesFromRes(code, length):
+    """ Convert a res code to the tiles (e.g. 'correct') the website shows """
+    return [r.name.lower() for r in decodeRes(code, length)]
+
+
+class GameServer(ThreadingHTTPServer):
+    """
+    An HTTP server hosting LocalGames (see the module docstring for the protocol)
+    """
+
+    def __init__(self, port=DEFAULT_PORT, host='localhost'):
+        super().__init__((host, port), _GameHandler)
+        self.games = {}
+        self.lengths = availableLengths()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def newGame(self, **kw):
+        length = len(kw['answer']) if kw.get('answer') is not None else kw.get('length', 5)
+        assert length in self.lengths, f"No words of length {length}"
+        game = LocalGame(**kw)
+        with self._lock:
+            game_id = str(next(self._ids))
+            self.games[game_id] = game
+        return game_id, game
+
+    def endGame(self, game_id):
+        with self._lock:
+            self.games.pop(game_id, None)
+
+
+class _GameHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_POST(self):
+        parts = self.path.strip('/').split('/')
+        try:
+            if parts == ['games']:
+                game_id, game = self.server.newGame(**self._body())
+                return self._reply(200, {'id': game_id, 'length': game.length,
+                                         'guesses': game.guesses})
+
+            if len(parts) == 3 and parts[0] == 'games' and parts[2] == 'guess':
+                game = self.server.games.get(parts[1])
+                if game is None:
+                    return self._reply(404, {'error': f"No game {parts[1]}"})
+                code = game.submit(self._body()['guess'])
+                return self._reply(200, {'tiles': tilesFromRes(code, game.length),
+                                         'done': game.done,
+                                         'answer': game.answer if game.done else None})
+        except (AssertionError, KeyError, TypeError, ValueError, OSError) as e:
+            return self._reply(400, {'error': repr(e)})
+        self._reply(404, {'error': f"No route {self.path}"})
+
+    def do_DELETE(self):
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'games':
+            self.server.endGame(parts[1])
+            return self._reply(200, {})
+        self._reply(404, {'error': f"No route {self.path}"})
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+class HTTPGame:
+    """
+    A client for a game hosted by a GameServer, starts a new game
+    with the given keyword args (see LocalGame)
+    """
+
+    def __init__(self, url=f"http://localhost:{DEFAULT_PORT}", **kw):
+        self.url = url.rstrip('/')
+        info = self._request('POST', '/games', kw)
+        self.id = info['id']
+        self.length = info['length']
+        self.guesses = info['guesses']
+        self.answer = None
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req) as resp:
+            return json.load(resp)
+
+    def submit(self, guess):
+        """ A submit func, submitting the guess to the server """
+        if not isinstance(guess, str):
+            guess = ''.join(guess)
+        reply = self._request('POST', f'/games/{self.id}/guess', {'guess': guess})
+        self.answer = reply['answer']
+        return encodeRes([Res[tile.upper()] for tile in reply['tiles']])
+
+    def shutDown(self):
+        """ End the game on the server """
+        self._request('DELETE', f'/games/{self.id}')
+
+
+def getArgs():
+    """
+    Parse the arguments
+    """
+    p = ArgumentParser(description="Serve local wordle games over HTTP")
+    p.add_argument('--port', default=DEFAULT_PORT, type=int,
+                   help="The port to serve games on.")
+    p.add_argument('--host', default='localhost',
+                   help="The host to serve games on.")
+    p.add_argument('-l', '--log', default='WARNING',
+            help='Log level, one of [DEBUG, INFO, WARNING, ERROR, CRITICAL')
+    return p.parse_args()
+
+
+def main():
+    """
+    Run a game server with arguments parsed from CLI
+    """
+    args = getArgs()
+    logging.basicConfig(level=getattr(logging, args.log),
+                        format='[%(asctime)s | %(name)s | %(levelname)s]: %(message)s')
+    server = GameServer(port=args.port, host=args.host)
+    print(f"Serving games on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
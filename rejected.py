@@ -0,0 +1,77 @@
+"""
+A module defining a persistent store of words the website rejected.
+
+When the website doesn't accept a guess (it isn't in the game's word list),
+it costs a round trip of typing the word, waiting for the result, and clearing
+the row. The RejectedStore records these words (per game, and per word length)
+in a JSON file, so solvers can filter them out of the corpus when they start,
+and data/gen_corpus.py can produce word lists with them pruned out.
+
+The website also gives an unresolved result when it's just slow to respond,
+so a word is only left out once it's been rejected at least MIN_COUNT times
+(a valid word is very unlikely to time out that often).
+
+The JSON file maps game -> length -> word -> number of times it was rejected.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+__all__ = ['RejectedStore']
+
+REJECTED_FNAME = "data/rejected.json"
+DEFAULT_GAME = "wordle"
+MIN_COUNT = 2
+
+class RejectedStore:
+    """
+    A persistent store of rejected words, saved to fname every time
+    a word is added.
+    """
+
+    def __init__(self, fname=REJECTED_FNAME):
+        self.fname = fname
+        self._lock = threading.Lock()
+        self._store = defaultdict(lambda: defaultdict(dict))
+        if os.path.exists(fname):
+            with open(fname, 'r') as f:
+                for game, lengths in json.load(f).items():
+                    for length, words in lengths.items():
+                        self._store[game][int(length)] = dict(words)
+
+    def words(self, length, game=DEFAULT_GAME, min_count=1):
+        """ Return the set of words of a given length rejected by a game at least min_count times """
+        words = self._store.get(game, {}).get(length, {})
+        return {word for word, count in words.items() if count >= min_count}
+
+    def add(self, word, game=DEFAULT_GAME):
+        """ Record that a game rejected word, and save the store """
+        with self._lock:
+            words = self._store[game][len(word)]
+            words[word] = words.get(word, 0) + 1
+            self.save()
+
+    def mask(self, corpus, length, game=DEFAULT_GAME, min_count=MIN_COUNT):
+        """
+        Return a boolean vector over a corpus (of words with a given length)
+        saying which words the game rejected (at least min_count times)
+        """
+        mask = np.zeros(len(corpus), dtype=bool)
+        for word in self.words(length, game=game, min_count=min_count):
+            idx = corpus.indexOf(word)
+            if idx is not None:
+                mask[idx] = True
+        return mask
+
+    def save(self):
+        """ Write the store to self.fname (via a temp file, so it's never left half written) """
+        tmp = self.fname + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({game: {str(length): words for length, words in lengths.items() if words}
+                       for game, lengths in self._store.items()},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, self.fname)
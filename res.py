@@ -1,13 +1,15 @@
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, Counter
+from functools import lru_cache
 from filt import UpperBound, LowerBound, HasLetterAt, NoLetterAt, FilterSet
 
 import numpy as np
 
 class Res(Enum):
     """
-    Encodes possible results for each letter in a guess,
-    submit_funcs return a list of these
+    Encodes possible results for each letter in a guess, a row
+    of these is packed into an integer code (see encodeRes), which
+    is what submit_funcs return
     """
     CORRECT = 2
     PRESENT = 1
@@ -21,23 +23,90 @@ class Res(Enum):
 # to keep up)
 VALID_RES = [Res.CORRECT, Res.ABSENT, Res.PRESENT]
 
-def filtersFromRes(res, guess):
+# The code for a row with any result not in VALID_RES
+INVALID_CODE = -1
+
+# Longest word length to precompute a decodeTable for
+MAX_TABLE_LENGTH = 8
+
+def encodeRes(res):
+    """
+    Pack a list of Res (one per letter) into a single integer code, in base 3
+    with the first letter as the least significant digit. Rows with any result
+    not in VALID_RES (e.g. TBD tiles from the website) are encoded as INVALID_CODE.
+    """
+    code, place = 0, 1
+    for r in res:
+        if r not in VALID_RES:
+            return INVALID_CODE
+        code += r.value * place
+        place *= 3
+    return code
+
+
+def decodeRes(code, length):
+    """
+    Unpack an integer code (from encodeRes) into a list of Res with
+    length elements, for displaying results.
+    """
+    if code == INVALID_CODE:
+        return [Res.TBD] * length
+    res = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        res.append(Res(digit))
+    return res
+
+
+def correctCode(length):
+    """ The code for a row of all CORRECT results """
+    return 3 ** length - 1
+
+
+def _filterOrder(code, length):
+    """
+    The (idx, Res) pairs for a code, in the order filtersFromRes needs
+    to go through them (matches first, then presents, then absents)
+    """
+    res = decodeRes(code, length)
+    inds = sorted(range(length), key=lambda x: res[x].value, reverse=True)
+    return tuple((idx, res[idx]) for idx in inds)
+
+
+@lru_cache(maxsize=None)
+def decodeTable(length):
     """
-    Given a res from a submit_func, and a guess from a guess_func, this
+    A table from every code for a given length to its _filterOrder, built
+    the first time it's needed. Only used for lengths up to MAX_TABLE_LENGTH,
+    since the table has 3 ** length entries.
+    """
+    return [_filterOrder(code, length) for code in range(3 ** length)]
+
+
+def filtersFromRes(code, guess):
+    """
+    Given a res code from a submit_func, and a guess from a guess_func, this
     compares the two and returns a filterset according to how the res did.
+    Raises a ValueError if code isn't a valid code for the guess's length
+    (e.g. INVALID_CODE).
     """
+    length = len(guess)
+    if not 0 <= code < 3 ** length:
+        raise ValueError(f"Invalid res code {code} for a guess of length {length}")
+
     lower_bounds = defaultdict(int)
     upper_bounds = defaultdict(int)
     must_not_be = defaultdict(set)
     must_be = defaultdict(set)
 
     # Have to go through the matches first, then the presents, then absents
-    inds = sorted(range(len(res)), key=lambda x: res[x].value, reverse=True)
-    res = np.array(res)[inds]
-    guess = np.array(list(guess))[inds]
+    if length <= MAX_TABLE_LENGTH:
+        order = decodeTable(length)[code]
+    else:
+        order = _filterOrder(code, length)
 
-    for i, (v,c) in enumerate(zip(res, guess)):
-        idx = inds[i]
+    for idx, v in order:
+        c = guess[idx]
         if v == Res.CORRECT:
             lower_bounds[c] += 1
             must_be[c].add(idx)
@@ -55,3 +124,49 @@ def filtersFromRes(res, guess):
                                for idx in idxes if lower_bounds[c] > 0])
     return fs
 
+
+def compare(known, guess):
+    """
+    Not quite a submit func, but by specifying a known word, this
+    will serve as a submit func, that just submits by comparing the
+    guess to the known, and returns the res code
+    """
+    if len(known) != len(guess):
+        raise ValueError(f"Can't compare {known!r} and {guess!r}, they're different lengths")
+
+    # Sometimes, e.g. word is curve, guess=kurre, only the first r should
+    # be PRESENT, so keep track of how many of each letter are left
+    # to match after the CORRECT ones
+    unmatched = Counter(k for k, g in zip(known, guess) if k != g)
+
+    code, place = 0, 1
+    for k, g in zip(known, guess):
+        if g == k:
+            code += Res.CORRECT.value * place
+        elif unmatched[g] > 0:
+            unmatched[g] -= 1
+            code += Res.PRESENT.value * place
+        place *= 3
+    return code
+
+
+def compareMany(letters, guess):
+    """
+    The vectorized version of compare, takes a numpy array of shape
+    (nWords, LENGTH) of known words (e.g. Corpus.letters), and returns
+    a numpy vector of shape nWords with the res code for guessing guess
+    against each of them.
+    """
+    guess = np.array(list(guess))
+    correct = letters == guess
+    digits = np.where(correct, Res.CORRECT.value, Res.ABSENT.value)
+
+    # Same as compare, for each letter only as many PRESENTs (going left
+    # to right) as are left in the known word after the CORRECT ones
+    for letter in set(guess):
+        unmatched = ((letters == letter) & ~correct).sum(axis=1)
+        for idx in np.flatnonzero(guess == letter):
+            present = ~correct[:, idx] & (unmatched > 0)
+            digits[present, idx] = Res.PRESENT.value
+            unmatched -= present
+    return digits @ (3 ** np.arange(len(guess)))
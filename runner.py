@@ -0,0 +1,130 @@
+"""
+A module for running many solver games concurrently in one process.
+
+Each game is driven through Solver.play, with its own np.random.Generator
+(so games using random guess_funcs don't share the global numpy rng), and an
+async submitter: a coroutine function that takes a guess and returns its res
+code. The guess_func calls (which are CPU bound) are run in an executor
+(a thread pool by default), so the event loop stays free to overlap many
+slow submitters (e.g. the website, remote judges, or local stand-ins).
+
+Example:
+
+    import asyncio, guess
+    from runner import runTrials
+    results = asyncio.run(runTrials(100, guess_func=guess.randomGuesser, seed=1, delay=0.5))
+"""
+from solve import Solver
+from res import compare
+from corpus import getCorpus
+import guess
+
+import asyncio
+
+import numpy as np
+
+__all__ = ['playGame', 'runGames', 'runTrials', 'blockingSubmitter', 'localSubmitter']
+
+
+############################################################
+# Async submit funcs (coroutine functions that take a guess,
+# submit it, and return the res code)
+############################################################
+
+def blockingSubmitter(submit_func, executor=None):
+    """
+    Wrap a regular (blocking) submit func, e.g. Solver.submit_web,
+    into an async submitter that runs it in executor
+    """
+    async def submitter(guess):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, submit_func, guess)
+    return submitter
+
+
+def localSubmitter(known, delay=0):
+    """
+    An async submitter that compares guesses to a known word,
+    after waiting delay seconds (to stand in for a slow website / judge)
+    """
+    async def submitter(guess):
+        await asyncio.sleep(delay)
+        return compare(known, guess)
+    return submitter
+
+
+############################################################
+# Running games
+############################################################
+
+def _advance(game, res=None):
+    """
+    Send res to a Solver.play generator, returning (done, value) where
+    value is the next guess, or the words left if the game is done
+    (StopIteration can't be raised out of an executor into asyncio)
+    """
+    try:
+        return False, (next(game) if res is None else game.send(res))
+    except StopIteration as e:
+        return True, e.value
+
+
+async def playGame(slv, submitter, rng=None, executor=None, getOptionsLeft=False, **kw):
+    """
+    Play a game with a Solver, awaiting submitter for the result of
+    each guess, and running the solver's guess_func in executor.
+
+    @param rng:
+        The np.random.Generator for this game (passed to the guess_func)
+
+    @param **kw:
+        Other kwargs to pass to the guess_func
+
+    @return:
+        The final word (None if it wasn't found) OR the words left
+        if getOptionsLeft = True, like Solver.run
+    """
+    loop = asyncio.get_running_loop()
+    game = slv.play(rng=rng, **kw)
+
+    done, value = await loop.run_in_executor(executor, _advance, game)
+    while not done:
+        res = await submitter(value)
+        done, value = await loop.run_in_executor(executor, _advance, game, res)
+
+    if slv.wi is not None:
+        await loop.run_in_executor(executor, slv.wi.shutDown)
+    return slv.final_word if not getOptionsLeft else value
+
+
+async def runGames(solvers, submitters, seed=None, executor=None, **kw):
+    """
+    Play a game for each (Solver, async submitter) pair concurrently,
+    giving each game an independent rng spawned from seed. Returns
+    the results of playGame for each game, in order.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(solvers))
+    return await asyncio.gather(*[
+        playGame(slv, submitter, rng=np.random.default_rng(s), executor=executor, **kw)
+        for slv, submitter, s in zip(solvers, submitters, seeds)])
+
+
+async def runTrials(nTrials, seed=None, nGuess=6, length=5, guess_func=None,
+                    delay=0, executor=None, **kw):
+    """
+    The concurrent version of solve.trial, runs nTrials games against
+    randomly chosen words (through localSubmitters waiting delay seconds
+    per guess), returning a list of whether the solver got each word.
+    """
+    rng = np.random.default_rng(seed)
+    wordArr = getCorpus(length).words
+    words = [wordArr[idx] for idx in rng.choice(len(wordArr), size=nTrials)]
+
+    guess_func = guess_func if guess_func else guess.randomGuesser
+    solvers = [Solver(guess_func=guess_func, length=length, guesses=nGuess,
+                      uses_web_interface=False) for _ in words]
+    submitters = [localSubmitter(word, delay=delay) for word in words]
+
+    final_words = await runGames(solvers, submitters, seed=int(rng.integers(2 ** 32)),
+                                 executor=executor, **kw)
+    return [final_word is not None for final_word in final_words]
@@ -3,7 +3,7 @@ from tqdm import tqdm
 
 def wordsLeft(wordArr0=None, guesses=['alien', 'torus']):
     if wordArr0 is None:
-        wordArr0 = load_arr(length=5)
+        wordArr0 = getCorpus(5).words
     
     cnts = [len(wordArr0)] * len(wordArr0)
     for i, base_word in tqdm(enumerate(wordArr0), total=len(wordArr0)):
@@ -1,7 +1,9 @@
 #!/Users/akshayyeluri/anaconda3/envs/web_bots/bin/python
-from web_interface import WebInterface, BIG_SLEEP
 from filt import FilterSet
-from res import Res, VALID_RES, filtersFromRes
+from corpus import getCorpus
+from rejected import RejectedStore, DEFAULT_GAME
+from res import (Res, VALID_RES, INVALID_CODE, filtersFromRes, compare,
+                 encodeRes, decodeRes, correctCode)
 import guess
 
 import os
@@ -18,19 +20,12 @@ GUESS_FUNCS = {func_name: getattr(guess, func_name) for func_name in dir(guess)
 # The default guessing function (should be the best one)
 DEFAULT_GUESS_FUNC = "scrabbleGuesser"
 
-FNAME = "data/length{}.txt"
 MAX_WEB_RETRIEVE_RETRIES = 3
 
-def load_words(length, fname=FNAME):
-    """ Load the list of words """
-    with open(fname.format(length), 'r') as f:
-        wordArr = [l.strip() for l in f.readlines()]
-    return wordArr
-
 
 ############################################################
 # Submit funcs (funcs that take a guess, submit it,
-# and return the result as a list of Res values)
+# and return the result as a res code, see res.encodeRes)
 ############################################################
 
 def interactiveSubmitter(guess):
@@ -44,37 +39,7 @@ def interactiveSubmitter(guess):
     res = input("Please enter the results of guess as 5 space separated integers "
                 f"with {option_str} (and {Res.TBD.value} for broken tiles): ")
     res = [Res(int(el)) for el in res.split()]
-    return res
-
-
-def compare(known, guess):
-    """
-    Not quite a submit func, but by specifying a known word, this
-    will serve as a submit func, that just submits by comparing the
-    guess to the known
-    """
-    guess, known = np.char.array(list(guess)), np.char.array(list(known))
-    res = np.where(np.isin(guess, known), Res.PRESENT, Res.ABSENT)
-    res[guess == known] = Res.CORRECT
-
-    # Sometimes, e.g. word is curve, guess=kurre, we get too many PRESENTs,
-    # because the first r matches, and the second says present.
-    # We want to rectify these
-    for letter in known:
-        cnt = (known == letter).sum()
-        present_inds = [idx for idx,(g,token) in enumerate(zip(guess, res)) 
-                            if (g == letter and token == Res.PRESENT)]
-        correct_inds = [idx for idx,(g,token) in enumerate(zip(guess, res)) 
-                            if (g == letter and token == Res.CORRECT)]
-
-        mistaken_present = (len(present_inds) + len(correct_inds)) - cnt
-        if mistaken_present == 0:
-            continue
-
-        for idx in present_inds[-mistaken_present:]:
-            res[idx] = Res.ABSENT
-
-    return list(res)
+    return encodeRes(res)
 
 
 ############################################################
@@ -82,7 +47,7 @@ def compare(known, guess):
 # guess funcs perform really)
 ############################################################
 
-def trial(word=None, seed=None, nGuess = 6, length=5, stopShort=True, guess_func=None, debugger=False, **kw):
+def trial(word=None, seed=None, nGuess = 6, length=5, stopShort=True, guess_func=None, debugger=False, rng=None, **kw):
     """
     Run a single trial where a solver tries to guess a word
 
@@ -111,6 +76,11 @@ def trial(word=None, seed=None, nGuess = 6, length=5, stopShort=True, guess_func
     @param debugger:
         Set to True to stop in the solver after each guess
 
+    @param rng:
+        A np.random.Generator to use (for choosing the word, and passed to
+        the guess_func) instead of the global numpy rng, so trials can run
+        concurrently
+
     @param **kw:
         Other kwargs to pass to the solver / guess_function
 
@@ -127,16 +97,18 @@ def trial(word=None, seed=None, nGuess = 6, length=5, stopShort=True, guess_func
 
     guesses = nGuess - 1 if stopShort else nGuess
     length = len(word) if word else length
-    guess_func = guess_func if guess_func else randomGuess
+    guess_func = guess_func if guess_func else guess.randomGuesser
 
     slv = Solver(guess_func=guess_func, length=length, guesses=guesses,
                  uses_web_interface=False)
 
     if not word:
-        idx = np.random.choice(len(slv.wordArr0))
+        idx = (rng if rng is not None else np.random).choice(len(slv.wordArr0))
         word = slv.wordArr0[idx]
 
     slv.submitter = lambda guess: compare(word, guess)
+    if rng is not None:
+        kw['rng'] = rng
 
     if stopShort:
         wordArr = slv.run(getOptionsLeft=True, debugger=debugger, **kw)
@@ -156,15 +128,19 @@ class Solver:
                  submit_func=None,
                  guess_func=None,
                  uses_web_interface=True,
-                 length=5, guesses=6):
+                 length=5, guesses=6,
+                 rejected_store=None, game=None):
 
         self.length = length
         self.guesses = guesses
 
         # If there is a web interface, use the length and guesses from that
         # instead
+        # (web_interface is only imported here, since it needs selenium,
+        # which offline solvers, e.g. in runner.py and bench.py, don't)
         self.wi = None
         if uses_web_interface:
+            from web_interface import WebInterface
             self.wi = WebInterface()
             self.length = self.wi.length
             self.guesses = self.wi.guesses
@@ -179,32 +155,70 @@ class Solver:
         # Use whatever guesser we're given
         self.guesser = guess_func
 
-        # Load the words we care about
-        self.wordArr0 = load_words(self.length)
+        # Get the words we care about (only loaded once per process), the corpus
+        # is never modified, words the submitter rejects are tracked in
+        # self.rejected instead
+        self.corpus = getCorpus(self.length)
+        self.wordArr0 = self.corpus.words
+        self.rejected = np.zeros(len(self.corpus), dtype=bool)
+
+        # If we have a RejectedStore, start off without the words this
+        # game rejected before, and record any new ones in it
+        self.rejected_store = rejected_store
+        self.game = game if game else DEFAULT_GAME
+        if self.rejected_store is not None:
+            self.rejected |= self.rejected_store.mask(self.corpus, self.length, game=self.game)
 
         self.final_word = None
 
 
     def run(self, seed=None, getOptionsLeft=False, debugger=False, **kw):
         # Some guess funcs (e.g. randomGuess) have randomness, so
-        # seed the rng for consistency
+        # seed the rng for consistency (pass rng=np.random.default_rng(...)
+        # instead to give this game its own rng)
         if seed:
             np.random.seed(seed)
 
+        game = self.play(debugger=debugger, **kw)
+        try:
+            guess = next(game)
+            while True:
+                guess = game.send(self.submitter(guess))
+        except StopIteration as e:
+            wordArr = e.value
+
+        if self.wi is not None:
+            self.wi.shutDown()
+        return self.final_word if not getOptionsLeft else wordArr
+
+
+    def play(self, debugger=False, **kw):
+        """
+        The game loop of the solver, as a generator that yields each guess
+        and expects to be sent back the res code for that guess (so the
+        caller decides how guesses get submitted). Returns the words left
+        at the end of the game, and sets self.final_word if it was found.
+        """
         fs = FilterSet()
-        wordArr = self.wordArr0
+        wordArr = self.corpus.view().exclude(self.rejected)
         guesses, resses = [], []
 
+        # Guess funcs are passed the rejected words too, since
+        # hard coded guesses don't come from wordArr
+        rejected = {self.corpus.words[idx] for idx in np.flatnonzero(self.rejected)}
+        self.final_word = None
+
         for guess_num in range(self.guesses):
             if debugger:
                 import pdb; pdb.set_trace()
 
             while True:
                 # Get a guess and submit it
-                guess = self.guesser(wordArr, fs=fs, guess_num=guess_num, **kw)
-                res = self.submitter(guess)
+                guess = self.guesser(wordArr, fs=fs, guess_num=guess_num,
+                                     rejected=rejected, **kw)
+                res = yield guess
 
-                if all([result in VALID_RES for result in res]):
+                if res != INVALID_CODE:
                     guesses.append(guess)
                     resses.append(res)
                     break
@@ -212,43 +226,49 @@ class Solver:
                 # if bad, remove from wordArr, call submitter with clear=True,
                 # and logging.warn it, then try again
                 else:
-                    logging.warning(f"{''.join(guess)} is not in wordle, please remove from corpus.")
+                    if self.rejected_store is not None:
+                        logging.warning(f"{''.join(guess)} is not in wordle, adding to rejected words.")
+                        self.rejected_store.add(''.join(guess), game=self.game)
+                    else:
+                        logging.warning(f"{''.join(guess)} is not in wordle, please remove from corpus.")
                     if self.wi is not None:
                         self.wi.clearGuess()
-                    if guess in wordArr:
-                        wordArr.remove(guess)
+                    rejected.add(''.join(guess))
+                    idx = self.corpus.indexOf(guess)
+                    if idx is not None:
+                        self.rejected[idx] = True
+                        wordArr = wordArr.exclude(self.rejected)
 
             # filter the words list using the new info we learned
             fs.update(filtersFromRes(resses[-1], guesses[-1]))
             wordArr = fs.applyAll(wordArr)
 
             logging.info(f"Guess number: {guess_num}")
-            logging.info(f"Guessed {guesses[-1]}, result was {resses[-1]}")
+            logging.info(f"Guessed {guesses[-1]}, result was {decodeRes(resses[-1], self.length)}")
             logging.info(f"{len(wordArr)} words left.")
 
             # If we've succeeded, save the final word and leave
-            if all([result == Res.CORRECT for result in resses[-1]]):
+            if resses[-1] == correctCode(self.length):
                 self.final_word = ''.join(guesses[-1])
                 break
 
-        if self.wi is not None:
-            self.wi.shutDown()
-        return self.final_word if not getOptionsLeft else wordArr
+        return wordArr
 
 
     def submit_web(self, guess):
         """
         Submits using the web interface.
         """
+        from web_interface import BIG_SLEEP
         self.wi.submit_guess(guess)
         # Keep trying till the values all resolve
         for _ in range(MAX_WEB_RETRIEVE_RETRIES):
             # Sleep to make sure we don't go too fast
             time.sleep(BIG_SLEEP)
             res = self.wi.retrieve_res()
-            res = [Res[value.upper()] for value in res]
+            res = encodeRes([Res[value.upper()] for value in res])
             # we finished getting the whole word
-            if all([r in VALID_RES for r in res]):
+            if res != INVALID_CODE:
                 return res
         return res
 
@@ -272,6 +292,8 @@ def getArgs():
                    help="Number of guesses the solver will get to find the word (only matters if no_use_web).")
     p.add_argument('--length', default=5, type=int,
                    help="Length of the words solver will be guessing (only matters if no_use_web).")
+    p.add_argument('--game', default=DEFAULT_GAME,
+                   help="The game being played, which the words it rejects are remembered for.")
     p.add_argument('-l', '--log', default='WARNING',
             help='Log level, one of [DEBUG, INFO, WARNING, ERROR, CRITICAL')
     return p.parse_args()
@@ -293,9 +315,13 @@ def main():
     if args.guess_func in GUESS_FUNCS:
         guess_func = GUESS_FUNCS[args.guess_func]
 
+    # Remember the words the website rejects, so we don't try them again
+    rejected_store = None if args.no_use_web else RejectedStore()
+
     slv = Solver(submit_func=submit_func, guess_func=guess_func,
                  uses_web_interface = (not args.no_use_web),
-                 length = args.length, guesses = args.nGuess)
+                 length = args.length, guesses = args.nGuess,
+                 rejected_store = rejected_store, game = args.game)
 
     final_word = slv.run(seed=args.seed, debugger=args.debug, getOptionsLeft=False)
     if final_word is not None:
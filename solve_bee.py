@@ -2,14 +2,12 @@
 A simple spelling bee solver to demonstrate the versatility of filter sets
 and stuff.
 """
-import os
 import itertools
 from filt import *
+from corpus import getCorpus, availableLengths
 from string import ascii_lowercase
 from collections import defaultdict
 
-DATA_ROOT = "/Users/akshayyeluri/code/sandbox/wordle"
-
 def solve(midLetter, letters, wordArr=None, minLength=4):
     letters = [l.lower() for l in letters]
     midLetter = midLetter.lower()
@@ -20,25 +18,17 @@ def solve(midLetter, letters, wordArr=None, minLength=4):
     fs = FilterSet([UpperBound(l, 0) for l in invalid])
     fs.add(LowerBound(midLetter, 1))
 
+    # Have to aggregate by length, by default use the (shared) corpus for each length
     if wordArr is None:
-        wordArr = load_arr()
-
-    # Have to aggregate by length
-    length2words = defaultdict(list)
-    for word in wordArr:
-        length2words[len(word)].append(word)
+        length2words = {length: getCorpus(length).view()
+                        for length in availableLengths() if length >= minLength}
+    else:
+        length2words = defaultdict(list)
+        for word in wordArr:
+            length2words[len(word)].append(word)
     
     # solution
-    length2ans = {k:fs.applyAll(v) for k,v in length2words.items()}
+    length2ans = {k:fs.applyAll(v) for k,v in length2words.items() if k >= minLength}
     
-    words = list(itertools.chain(*[v for k,v in length2ans.items() if k >= minLength]))
+    words = list(itertools.chain(*length2ans.values()))
     return words
-
-
-
-def load_arr(root=DATA_ROOT, name="full_dict.txt"):
-    """ Load a wordArr """
-    with open(os.path.join(root, name), 'r') as f:
-        wordArr = [l.strip().lower() for l in f.readlines()]
-    return wordArr
-
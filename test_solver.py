@@ -0,0 +1,139 @@
+"""
+Regression checks for the solver, run with python -m pytest (from the repo root).
+"""
+from res import compare, decodeRes, correctCode, filtersFromRes, Res, INVALID_CODE
+from corpus import getCorpus
+from guess import SearchBudget, expectedGuesses, letterCoverageRank, partition, lookaheadGuesser
+from solve import trial
+
+import pytest
+
+C, P, A = Res.CORRECT, Res.PRESENT, Res.ABSENT
+
+@pytest.mark.parametrize("known, guess, expected", [
+    ("curve", "kurre", [A, C, C, A, C]),
+    ("sargassa", "disports", [A, A, P, A, A, P, A, P]),
+    ("aabbb", "bbaaa", [P, P, P, P, A]),
+    ("shire", "shire", [C, C, C, C, C]),
+])
+def test_compare_repeated_letters(known, guess, expected):
+    assert decodeRes(compare(known, guess), len(guess)) == expected
+
+
+@pytest.mark.parametrize("known, guess", [("shire", "al"), ("al", "shire"), ("shire", "shires")])
+def test_compare_different_lengths(known, guess):
+    with pytest.raises(ValueError):
+        compare(known, guess)
+
+
+@pytest.mark.parametrize("guess", ["shire", "sargassa", "precautions"])
+@pytest.mark.parametrize("code", [INVALID_CODE, "too_big"])
+def test_filters_from_invalid_res(code, guess):
+    code = 3 ** len(guess) if code == "too_big" else code
+    with pytest.raises(ValueError):
+        filtersFromRes(code, guess)
+
+
+def _scores(wordArr, depth, beam_width):
+    """ The unbudgeted score of each probe expectedGuesses considers for wordArr """
+    scores = {}
+    for guess in letterCoverageRank(wordArr)[:beam_width]:
+        score = 1
+        for res, bucket in partition(guess, wordArr).items():
+            if res == correctCode(len(guess)):
+                continue
+            sub, _ = expectedGuesses(bucket, depth - 1, beam_width, {}, SearchBudget())
+            score += len(bucket) / len(wordArr) * sub
+        scores[guess] = score
+    return scores
+
+
+@pytest.mark.parametrize("node_budget", [3, 100, 2000])
+def test_lookahead_budget_only_picks_fully_scored_guesses(node_budget):
+    buckets = partition("alien", getCorpus(5).words)
+    wordArr = max(buckets.values(), key=len)
+    scores = _scores(wordArr, 2, 10)
+    ranked = list(scores)
+
+    score, guess = expectedGuesses(wordArr, 2, 10, {}, SearchBudget(node_budget=node_budget))
+    # The first guess is kept (with a lower bound score) if no guess was fully scored
+    assert score == pytest.approx(scores[guess]) or guess == ranked[0]
+    assert scores[guess] == pytest.approx(min(scores[g] for g in ranked[:ranked.index(guess) + 1]))
+
+    full_score, _ = expectedGuesses(wordArr, 2, 10, {}, SearchBudget())
+    assert full_score == pytest.approx(min(scores.values()))
+
+
+def test_expected_guesses_no_words():
+    with pytest.raises(ValueError):
+        expectedGuesses([], 2, 10, {}, SearchBudget())
+
+
+@pytest.mark.parametrize("length", [4, 6, 8])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_lookahead_trial_other_lengths(length, seed):
+    # The hard coded opener is 5 letters, so shouldn't be guessed at other lengths
+    assert trial(seed=seed, length=length, stopShort=False,
+                 guess_func=lookaheadGuesser, node_budget=50)
+
+
+def test_run_trials_offline():
+    # runner (and solve) shouldn't need selenium unless the web interface is used
+    import asyncio
+    from runner import runTrials
+    results = asyncio.run(runTrials(3, seed=1, length=5))
+    assert len(results) == 3 and all(isinstance(r, bool) for r in results)
+
+
+def test_rejected_store_min_count(tmp_path):
+    from rejected import RejectedStore
+    corpus = getCorpus(5)
+    store = RejectedStore(fname=str(tmp_path / "rejected.json"))
+    store.add("alien")
+    store.add("torus")
+    store.add("torus")
+
+    # One unresolved result could just be the website being slow
+    store = RejectedStore(fname=store.fname)
+    assert {corpus.words[i] for i in store.mask(corpus, 5).nonzero()[0]} == {"torus"}
+    assert store.mask(corpus, 5, game="other").sum() == 0
+    assert store.words(5, min_count=1) == {"alien", "torus"}
+
+
+@pytest.mark.parametrize("kw", [dict(mode='fixed', answer='zzzzz'), dict(guesses=0)])
+def test_local_game_invalid(kw):
+    from local_game import LocalGame
+    with pytest.raises(AssertionError):
+        LocalGame(**kw)
+
+
+def test_adversarial_game():
+    import numpy as np
+    from local_game import LocalGame
+    from res import compareMany
+    corpus = getCorpus(5)
+    game = LocalGame(mode='adversarial', guesses=20)
+    cands = np.arange(len(corpus))
+
+    while len(cands) > 1:
+        assert game.answer is None
+        guess = corpus.words[cands[0]]
+        codes = compareMany(corpus.letters[cands], guess)
+        buckets, sizes = np.unique(codes, return_counts=True)
+        biggest = sizes[buckets != correctCode(5)].max()
+
+        code = game.submit(guess)
+        assert code != correctCode(5) and (codes == code).sum() == biggest
+        cands = cands[codes == code]
+
+    assert game.answer == corpus.words[cands[0]]
+    assert game.submit(game.answer) == correctCode(5) and game.done
+
+
+def test_adversarial_cache_bytes(monkeypatch):
+    import local_game
+    monkeypatch.setattr(local_game, 'CACHE_BYTES', 200 * 1024)
+    corpus = getCorpus(5)
+    for word in corpus.words[:20]:
+        local_game.LocalGame(mode='adversarial').submit(word)
+        assert local_game._splitsBytes <= local_game.CACHE_BYTES